@@ -91,6 +91,36 @@ class LocalDensity(object):
         """
         raise NotImplementedError()
 
+    def multi_evaluate(self, x, y, out=None):
+        """Evaluate log of the density to propose ``x[i]`` given ``y[i]``,
+        namely log(q(x[i]|y[i])), for each row i.
+
+        :param x:
+
+            Matrix-like array; the proposed points. Expect i-th accessible
+            as ``x[i]``.
+
+        :param y:
+
+            Matrix-like array; the current points, ``len(y)==len(x)``.
+
+        :param out:
+
+            Vector-like array, length==``len(x)``, optional; If provided,
+            the output is written into this array.
+
+        """
+        assert len(x) == len(y)
+        if out is None:
+            out = _np.empty(len(x))
+        else:
+            assert len(out) == len(x)
+
+        for i, (point, current) in enumerate(zip(x, y)):
+            out[i] = self.evaluate(point, current)
+
+        return out
+
     def propose(self, y, rng=_np.random.mtrand):
         """propose(self, y, rng=numpy.random.mtrand)
         Propose a new point given ``y`` using the random number
@@ -106,3 +136,25 @@ class LocalDensity(object):
 
         """
         raise NotImplementedError()
+
+    def propose_batch(self, N=1, rng=_np.random.mtrand):
+        """propose_batch(self, N=1, rng=numpy.random.mtrand)
+        Propose ``N`` independent steps at once using the random number
+        generator ``rng``. Return a matrix with one step per row such
+        that ``y + step`` is distributed like ``propose(y, rng)``.
+
+        Only translation-invariant densities, i.e.
+        :math:`q(x|y) = q(x-y)`, can implement this method. It allows
+        the :py:class:`pypmc.sampler.markov_chain.MarkovChain` to
+        draw all proposals of a run in a single call.
+
+        :param N:
+
+            Integer; the number of steps to be proposed
+
+        :param rng:
+
+            State of a random number generator like numpy.random.mtrand
+
+        """
+        raise NotImplementedError()
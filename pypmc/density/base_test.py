@@ -30,3 +30,27 @@ class TestProbabilityDensity(unittest.TestCase):
     def test_multi_evaluate_no_out(self):
         out = self.density.multi_evaluate(self.evaluate_at)
         np.testing.assert_allclose(out, self.target)
+
+# dummy local proposal (convenient for testing):
+#   - evaluates to the first item in x - y
+class DummyLocalDensity(LocalDensity):
+    def __init__(self):
+        pass
+    def evaluate(self, x, y):
+        return x[0] - y[0]
+
+class TestLocalDensity(unittest.TestCase):
+    def test_multi_evaluate(self):
+        density = DummyLocalDensity()
+        x = np.array([[0.1, 3.4], [1.2, 5.9], [7.5, 4.5]])
+        y = np.array([[1.0, 0.0], [0.2, 1.0], [7.5, 0.0]])
+        target = np.array( (-0.9, 1.0, 0.0) )
+
+        np.testing.assert_allclose(density.multi_evaluate(x, y), target)
+
+        out1 = np.empty(3)
+        out2 = density.multi_evaluate(x, y, out1)
+        np.testing.assert_allclose(out1, target)
+        assert out1 is out2
+
+        self.assertRaises(AssertionError, density.multi_evaluate, x, y[:2])
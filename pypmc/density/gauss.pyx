@@ -51,6 +51,10 @@ class LocalGauss(LocalDensity):
         """transform sample from standard gauss to Gauss(mean=0, sigma=sigma)"""
         return _np.dot(self.cholesky_sigma, rng.normal(0, 1, self.dim))
 
+    def _get_gauss_samples(self, N, rng):
+        """transform N samples from standard gauss to Gauss(mean=0, sigma=sigma)"""
+        return _np.dot(rng.normal(0, 1, N * self.dim).reshape(N, self.dim), self.cholesky_sigma.T)
+
     def _compute_norm(self):
         'Compute the normalization'
         self.log_normalization = -0.5 * self.dim * log(2 * _np.pi) - 0.5 * self.log_det_sigma
@@ -59,6 +63,31 @@ class LocalGauss(LocalDensity):
     def evaluate(self, _np.ndarray[double, ndim=1] x, _np.ndarray[double, ndim=1] y):
         return self.log_normalization - .5 * bilinear_sym(self.inv_sigma, x - y)
 
+    @_inherit_docstring(LocalDensity)
+    def multi_evaluate(self, _np.ndarray[double, ndim=2] x not None, _np.ndarray[double, ndim=2] y not None,
+                       _np.ndarray[double, ndim=1] out=None):
+        assert len(x) == len(y)
+        if out is None:
+            out = _np.empty(len(x))
+        else:
+            assert len(out) == len(x)
+
+        cdef:
+            double log_normalization = self.log_normalization
+            double [:]   diff        = _np.empty(self.dim)
+            double [:]   results     = out
+            double [:,:] inv_sigma   = self.inv_sigma
+            size_t       i, n
+
+        for n in range(len(x)):
+            # compute difference
+            for i in range(len(diff)):
+                diff[i] = x[n,i] - y[n,i]
+
+            results[n] = log_normalization - .5 * bilinear_sym(inv_sigma, diff)
+
+        return out
+
     @_add_to_docstring('''    .. important::\n
                 ``rng`` must return a numpy array of N samples from:\n
                 - **rng.normal(0,1,N)**: standard gaussian distribution\n''')
@@ -66,6 +95,13 @@ class LocalGauss(LocalDensity):
     def propose(self, y, rng=_np.random.mtrand):
         return y + self._get_gauss_sample(rng)
 
+    @_add_to_docstring('''    .. important::\n
+                ``rng`` must meet the requirements of
+                :py:meth:`.LocalGauss.propose`.\n\n''')
+    @_inherit_docstring(LocalDensity)
+    def propose_batch(self, N=1, rng=_np.random.mtrand):
+        return self._get_gauss_samples(N, rng)
+
 class Gauss(ProbabilityDensity):
     r"""A Gaussian probability density. Can be used as component for
     MixtureDensities.
@@ -157,7 +193,7 @@ class Gauss(ProbabilityDensity):
             ``rng`` must meet the requirements of
             :py:meth:`.LocalGauss.propose`.\n\n""")
     def propose(self, int N=1, rng=_np.random.mtrand):
-        output = _np.empty((N,self.dim))
-        for i in range(N):
-            output[i] = self._local_gauss.propose(self.mu, rng)
+        # one matrix product with the cached cholesky factor for all points
+        output  = self._local_gauss.propose_batch(N, rng)
+        output += self.mu
         return output
@@ -54,6 +54,19 @@ class TestLocalGauss(unittest.TestCase):
         self.assertAlmostEqual(t.evaluate(x, y), target, delta=delta)
         self.assertAlmostEqual(t.evaluate(y, x), target, delta=delta)
 
+    def test_multi_evaluate(self):
+        t = LocalGauss(sigma=offdiag_sigma)
+
+        x = np.array([[4.3 , 1.1], [0. , 0.], [-1.2, 0.5]])
+        y = np.array([[4.35, 1.2], [0.1, 0.], [-1.2, 0.5]])
+        target = np.array([t.evaluate(xi, yi) for xi, yi in zip(x, y)])
+
+        np.testing.assert_equal(t.multi_evaluate(x, y), target)
+
+        out = np.empty(3)
+        self.assertIs(t.multi_evaluate(x, y, out), out)
+        np.testing.assert_equal(out, target)
+
     def test_propose(self):
         sigma = offdiag_sigma
         delta_chisq = .005
@@ -107,6 +120,32 @@ class TestLocalGauss(unittest.TestCase):
         self.assertAlmostEqual(var0 , target_var0 , delta=delta_var0)
         self.assertAlmostEqual(var1 , target_var1 , delta=delta_var1)
 
+    def test_propose_batch(self):
+        delta_mean = .001
+        delta_var0 = .0001
+        delta_var1 = .00003
+
+        t = LocalGauss(sigma=offdiag_sigma)
+
+        np.random.seed(rng_seed)
+        steps = t.propose_batch(rng_steps, np.random)
+        self.assertEqual(steps.shape, (rng_steps, 2))
+
+        # test if value for rng can be omitted
+        self.assertEqual(t.propose_batch(3).shape, (3, 2))
+
+        np.testing.assert_allclose(steps.mean(axis=0), 0., atol=delta_mean)
+        self.assertAlmostEqual(steps[:,0].var(), offdiag_sigma[0,0], delta=delta_var0)
+        self.assertAlmostEqual(steps[:,1].var(), offdiag_sigma[1,1], delta=delta_var1)
+
+        # same random numbers --> same points as ``propose``
+        current = np.array([4.3, 1.1])
+        np.random.seed(rng_seed)
+        steps = t.propose_batch(10, np.random)
+        np.random.seed(rng_seed)
+        for i in range(10):
+            np.testing.assert_allclose(current + steps[i], t.propose(current, np.random), rtol=1e-14)
+
 class TestGauss(unittest.TestCase):
     sigma = np.array([[0.01 , 0.003 ]
                      ,[0.003, 0.0025]])
@@ -2,7 +2,7 @@
 
 import numpy as _np
 from scipy.special import gammaln as _gammaln
-from .base import ProbabilityDensity
+from .base import ProbabilityDensity, LocalDensity
 from .gauss import LocalGauss
 from ..tools._doc import _inherit_docstring, _add_to_docstring
 
@@ -38,6 +38,33 @@ class LocalStudentT(LocalGauss):
         return self.log_normalization  - .5 * (self.dof + self.dim) \
             * log(1. + bilinear_sym(self.inv_sigma, x - y) / self.dof)
 
+    @_inherit_docstring(LocalDensity)
+    def multi_evaluate(self, _np.ndarray[double, ndim=2] x not None, _np.ndarray[double, ndim=2] y not None,
+                       _np.ndarray[double, ndim=1] out=None):
+        assert len(x) == len(y)
+        if out is None:
+            out = _np.empty(len(x))
+        else:
+            assert len(out) == len(x)
+
+        cdef:
+            double       log_norm   = self.log_normalization
+            double       prefactor  = .5 * (self.dof + self.dim)
+            double       dof        = self.dof
+            double [:]   diff       = _np.empty(self.dim)
+            double [:]   results    = out
+            double [:,:] inv_sigma  = self.inv_sigma
+            size_t       i, n
+
+        for n in range(len(x)):
+            # compute difference
+            for i in range(len(diff)):
+                diff[i] = x[n,i] - y[n,i]
+
+            results[n] = log_norm - prefactor * log(1. + bilinear_sym(inv_sigma, diff) / dof)
+
+        return out
+
     @_add_to_docstring('''    .. important::\n
                 ``rng`` must return\n
                 - a numpy array of N samples from
@@ -54,6 +81,19 @@ class LocalStudentT(LocalGauss):
 
         return y + self._get_gauss_sample(rng) * sqrt(self.dof / rng.chisquare(self.dof))
 
+    @_add_to_docstring('''    .. important::\n
+                ``rng`` must return\n
+                - a numpy array of N samples from
+                  **rng.normal(0,1,N)**: standard gaussian distribution
+                - a numpy array of N samples from
+                  **rng.chisquare(degree_of_freedom, N)**: any chi-squared
+                  distribution\n\n''')
+    @_inherit_docstring(LocalDensity)
+    def propose_batch(self, N=1, rng=_np.random.mtrand):
+        steps  = self._get_gauss_samples(N, rng)
+        steps *= _np.sqrt(self.dof / rng.chisquare(self.dof, N))[:,None]
+        return steps
+
 class StudentT(ProbabilityDensity):
     r"""A Student's t probability density. Can be used as a component in
     MixtureDensities.
@@ -129,7 +169,7 @@ class StudentT(ProbabilityDensity):
         for i in range(dim):
             tmp[i] = x[i] - mu[i]
 
-        return log_norm  + prefactor * log(1. + bilinear_sym(self.inv_sigma, tmp) * inv_dof)
+        return log_norm  + prefactor * log(1. + bilinear_sym(inv_sigma, tmp) * inv_dof)
 
     @_inherit_docstring(ProbabilityDensity)
     def multi_evaluate(self, _np.ndarray[double, ndim=2] x not None, _np.ndarray[double, ndim=1] out=None):
@@ -153,10 +193,10 @@ class StudentT(ProbabilityDensity):
 
         for n in range(N):
             # compute difference
-            for i in range(len(diff)):
+            for i in range(dim):
                 diff[i] = x[n,i] - mu[i]
 
-            results[n]  = bilinear_sym(self.inv_sigma, diff)
+            results[n]  = bilinear_sym(inv_sigma, diff)
             results[n] *= inv_dof
             results[n] += 1.
             results[n]  = log(results[n])
@@ -170,7 +210,19 @@ class StudentT(ProbabilityDensity):
                 :py:meth:`.LocalStudentT.propose`.\n\n""")
     @_inherit_docstring(ProbabilityDensity)
     def propose(self, int N=1, rng=_np.random.mtrand):
-        output = _np.empty((N,self.dim))
+        # draw the random numbers in the same order as ``N`` calls to
+        # LocalStudentT.propose, then transform all points at once
+        cdef:
+            size_t i
+            double dof = self.dof
+            double [:] chi_square
+        gauss = _np.empty((N,self.dim))
+        chi_square = _np.empty(N)
         for i in range(N):
-            output[i] = self._local_t.propose(self.mu, rng)
+            gauss[i]      = rng.normal(0, 1, self.dim)
+            chi_square[i] = rng.chisquare(dof)
+
+        output  = _np.dot(gauss, self._local_t.cholesky_sigma.T)
+        output *= _np.sqrt(dof / _np.asarray(chi_square))[:,None]
+        output += self.mu
         return output
@@ -78,6 +78,21 @@ class TestLocalStudentT(unittest.TestCase):
         self.assertAlmostEqual(t.evaluate(x2, x0), target2, delta=delta)
         self.assertAlmostEqual(t.evaluate(x0, x2), target2, delta=delta)
 
+    def test_multi_evaluate(self):
+        sigma = np.array([[0.0049, 0.  ]
+                         ,[0.    ,  .01]])
+        t = LocalStudentT(sigma=sigma, dof=5.)
+
+        x = np.array([[1.3 , 4.4  ], [1.26, 4.424], [1.25, 4.3]])
+        y = np.array([[1.25, 4.3  ], [1.25, 4.3  ], [1.25, 4.3]])
+        target = np.array([t.evaluate(xi, yi) for xi, yi in zip(x, y)])
+
+        np.testing.assert_equal(t.multi_evaluate(x, y), target)
+
+        out = np.empty(3)
+        self.assertIs(t.multi_evaluate(x, y, out), out)
+        np.testing.assert_equal(out, target)
+
     def test_propose_covariance(self):
         sigma = np.array([[.2]])
         dof   = 5.
@@ -152,6 +167,26 @@ class TestLocalStudentT(unittest.TestCase):
         self.assertAlmostEqual(mean1, target_mean1, delta=delta_mean)
         self.assertAlmostEqual(var1 , target_var1 , delta=delta_var1)
 
+    def test_propose_batch(self):
+        sigma      = offdiag_sigma
+        dof        = 5.
+        delta_mean = .001
+        delta_var0 = .0006
+        delta_var1 = .00004
+
+        t = LocalStudentT(sigma=sigma, dof=dof)
+
+        np.random.seed(rng_seed)
+        steps = t.propose_batch(rng_steps, np.random)
+        self.assertEqual(steps.shape, (rng_steps, 2))
+
+        # test if value for rng can be omitted
+        self.assertEqual(t.propose_batch(3).shape, (3, 2))
+
+        np.testing.assert_allclose(steps.mean(axis=0), 0., atol=delta_mean)
+        self.assertAlmostEqual(steps[:,0].var(), offdiag_sigma[0,0] * dof/(dof-2), delta=delta_var0)
+        self.assertAlmostEqual(steps[:,1].var(), offdiag_sigma[1,1] * dof/(dof-2), delta=delta_var1)
+
     def test_1D(self):
         sigma = 1
         dof = 1 # Cauchy
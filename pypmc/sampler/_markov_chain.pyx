@@ -0,0 +1,95 @@
+"""Compiled accept-reject loop of the Markov chain"""
+
+import numpy as _np
+cimport numpy as _np
+
+def walk(target, double[:] current_point, double[:] current_eval,
+         double[:,:] increments, double[:] log_u, double[:,:] out, unsigned char[:] accepted,
+         double[:] log_hastings=None, double[:] target_values=None,
+         bint continue_on_NaN=False):
+    '''Run a random-walk Markov chain for ``len(log_u)`` steps. The state
+    and the visited points are updated in place, so they are valid up to
+    the failing step even if an exception is raised.
+
+    :param target:
+
+        The target density; called with a numpy array and returns the
+        log of the target.
+
+    :param current_point:
+
+        Vector-like array; the current point of the chain.
+
+    :param current_eval:
+
+        Vector-like array of length one; the target at ``current_point``.
+
+    :param increments:
+
+        Matrix-like array; the proposed step in each row.
+
+    :param log_u:
+
+        Vector-like array; the log of uniform random numbers for the
+        accept-reject decisions.
+
+    :param out:
+
+        Matrix-like array; the visited point is stored in each row.
+
+    :param accepted:
+
+        Vector-like array of ``unsigned char``; flags the accepted steps.
+
+    :param log_hastings:
+
+        Vector-like array or None; the log of the Hastings factor of each
+        step. ``None`` for a symmetric proposal.
+
+    :param target_values:
+
+        Vector-like array or None; if given, store the target at the
+        current point after each step.
+
+    :param continue_on_NaN:
+
+        Bool; if ``False``, raise a ``ValueError`` when encountering an
+        NaN.
+
+    '''
+    cdef:
+        Py_ssize_t i, j
+        Py_ssize_t N = log_u.shape[0], dim = current_point.shape[0]
+        double[:] proposed_view
+        double proposed_eval, log_rho
+
+    for i in range(N):
+        # propose new point
+        proposed_array = _np.empty(dim)
+        proposed_view = proposed_array
+        for j in range(dim):
+            proposed_view[j] = current_point[j] + increments[i,j]
+        proposed_eval = target(proposed_array)
+
+        # log_rho := log(probability to accept point), where log_rho > 0 is meant to imply rho = 1
+        # metropolis ratio, times the hastings factor if needed
+        log_rho = proposed_eval - current_eval[0]
+        if log_hastings is not None:
+            log_rho += log_hastings[i]
+
+        # check for NaN; NaN is the only value not equal to itself
+        if log_rho != log_rho:
+            if not continue_on_NaN: raise ValueError('encountered NaN')
+            # otherwise reject
+
+        # log_u <= 0 --> also accepts if rho >= 1
+        elif log_rho >= log_u[i]:
+            accepted[i] = True
+            current_point[:] = proposed_view
+            current_eval[0] = proposed_eval
+
+        out[i,:] = current_point
+
+        # save target value if desired
+        if target_values is not None:
+            target_values[i] = current_eval[0]
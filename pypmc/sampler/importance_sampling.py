@@ -4,7 +4,6 @@
 """
 
 import numpy as _np
-from math import exp as _exp
 from copy import deepcopy as _cp
 from ..tools._doc import _inherit_docstring
 from ..tools import History as _History
@@ -74,13 +73,16 @@ def calculate_covariance(samples, weights):
     '''
     assert len(samples) == len(weights), "The number of samples (got %i) must equal the number of weights (got %i)." % (len(samples),len(weights))
 
-    sum_weights_sq = (weights.sum())**2
+    weights = _np.asarray(weights)
+
+    sum_weights    = weights.sum()
     sum_sq_weights = (weights**2).sum()
 
-    mean  = calculate_mean(samples, weights)
+    deviations = samples - calculate_mean(samples, weights)
 
-    return sum_weights_sq / (sum_weights_sq - sum_sq_weights)  *\
-           calculate_expectation(samples, weights, lambda x: _np.einsum('i,j', x - mean, x - mean))
+    # unbiased estimate; ``numpy.cov(aweights=...)`` would reject negative weights
+    return sum_weights / (sum_weights**2 - sum_sq_weights)  *\
+           _np.dot(weights * deviations.T, deviations)
 
 _docstring_params_importance_sampler = """:param target:
 
@@ -200,15 +202,16 @@ class ImportanceSampler(object):
         this_weights = self.weights.append(N)[:,0]
 
         if self.target_values is None:
-            for i in range(N):
-                tmp = self.target(this_samples[i]) - self.proposal.evaluate(this_samples[i])
-                this_weights[i] = _exp(tmp)
+            this_target_values = _np.empty(N)
         else:
-            this_target_values = self.target_values.append(N)
-            for i in range(N):
-                this_target_values[i] = self.target(this_samples[i])
-                tmp = this_target_values[i] - self.proposal.evaluate(this_samples[i])
-                this_weights[i] = _exp(tmp)
+            this_target_values = self.target_values.append(N)[:,0]
+
+        # the target is not called outside the indicator but returns -inf
+        for i in range(N):
+            this_target_values[i] = self.target(this_samples[i])
+
+        # evaluate the proposal at all samples in one call
+        _np.exp(this_target_values - self.proposal.multi_evaluate(this_samples), out=this_weights)
 
     def _get_samples(self, N, trace_sort):
         """Save N samples from ``self.proposal`` to ``self.samples``
@@ -5,7 +5,7 @@
 from .importance_sampling import *
 from .. import density
 from ..density.mixture_test import DummyComponent
-from ..tools._probability_densities import unnormalized_log_pdf_gauss, normalized_pdf_gauss
+from ..tools._probability_densities import unnormalized_log_pdf_gauss
 from ..tools import History
 from nose.plugins.attrib import attr
 import numpy as np
@@ -53,29 +53,68 @@ def raise_not_implemented(x):
         return 1.
     raise NotImplementedError()
 
+# unimodal problem: unnormalized Gauss target and Student-t proposal
+unimodal_mean  = np.array( [-4.4,  2.8   ])
+unimodal_sigma = np.array([[0.01 , 0.003 ]
+                          ,[0.003, 0.0025]])
+unimodal_inv_sigma = np.linalg.inv(unimodal_sigma)
+unimodal_log_target = lambda x: unnormalized_log_pdf_gauss(x, unimodal_mean, unimodal_inv_sigma)
+
+unimodal_prop_dof   = 5.
+unimodal_prop_mean  = np.array([-4.3, 2.9])
+unimodal_prop_sigma = np.array([[0.007, 0.0   ]
+                               ,[0.0  , 0.0023]])
+unimodal_prop       = density.student_t.StudentT(unimodal_prop_mean, unimodal_prop_sigma, unimodal_prop_dof)
+
+# bimodal problem: Gaussian mixture target and Student-t mixture proposal
+bimodal_abundances = np.array((.6, .4))
+
+bimodal_mean1  = np.array( [-5.  , 0.    ])
+bimodal_sigma1 = np.array([[0.01 , 0.003 ],
+                           [0.003, 0.0025]])
+bimodal_inv_sigma1 = np.linalg.inv(bimodal_sigma1)
+
+bimodal_mean2  = np.array( [+5. , 0.   ])
+bimodal_sigma2 = np.array([[0.1 , 0.0  ],
+                           [0.0 , 0.5  ]])
+bimodal_inv_sigma2 = np.linalg.inv(bimodal_sigma2)
+
+# log of abundance times normalization of each component
+bimodal_log_norm1 = log(bimodal_abundances[0]) - .5 * np.linalg.slogdet(2. * np.pi * bimodal_sigma1)[1]
+bimodal_log_norm2 = log(bimodal_abundances[1]) - .5 * np.linalg.slogdet(2. * np.pi * bimodal_sigma2)[1]
+
+bimodal_log_target = lambda x: np.logaddexp(bimodal_log_norm1 + unnormalized_log_pdf_gauss(x, bimodal_mean1, bimodal_inv_sigma1),
+                                            bimodal_log_norm2 + unnormalized_log_pdf_gauss(x, bimodal_mean2, bimodal_inv_sigma2)) + \
+                                            15. # break normalization
+
+bimodal_prop_abundances = np.array((.5, .5))
+
+bimodal_prop_dof1   = 5.
+bimodal_prop_mean1  = np.array( [-4.9  , 0.01  ])
+bimodal_prop_sigma1 = np.array([[ 0.007, 0.0   ],
+                                [ 0.0  , 0.0023]])
+bimodal_prop1       = density.student_t.StudentT(bimodal_prop_mean1, bimodal_prop_sigma1, bimodal_prop_dof1)
+
+bimodal_prop_dof2   = 5.
+bimodal_prop_mean2  = np.array( [+5.08, 0.01])
+bimodal_prop_sigma2 = np.array([[ 0.14, 0.01],
+                                [ 0.01, 0.6 ]])
+bimodal_prop2       = density.student_t.StudentT(bimodal_prop_mean2, bimodal_prop_sigma2, bimodal_prop_dof2)
+
+bimodal_prop = density.mixture.MixtureDensity((bimodal_prop1, bimodal_prop2), bimodal_prop_abundances)
+
 def unimodal_sampling(instance, ImportanceSamplerClass):
-    # test weighted sampling from an unnormalized Gauss using a Student-t proposal
+    # test weighted sampling from an unnormalized Gauss using a Student-t proposal;
+    # the sampler copies the proposal, so the module-level one is never modified
 
     minus_log_ten_delta_mean = 2
     minus_log_ten_delta_cov  = 3
 
-    # target
-    mean  = np.array( [-4.4,  2.8   ])
-    sigma = np.array([[0.01 , 0.003 ]
-                     ,[0.003, 0.0025]])
-    inv_sigma = np.linalg.inv(sigma)
-    log_target = lambda x: unnormalized_log_pdf_gauss(x, mean, inv_sigma)
-
-    # proposal
-    prop_dof   = 5.
-    prop_mean  = np.array([-4.3, 2.9])
-    prop_sigma = np.array([[0.007, 0.0   ]
-                          ,[0.0  , 0.0023]])
-    prop       = density.student_t.StudentT(prop_mean, prop_sigma, prop_dof)
-
-    sam = ImportanceSamplerClass(log_target, prop, prealloc = rng_steps, indicator = None, rng = np.random.mtrand)
-    for i in range(10):
-        sam.run(rng_steps//10)
+    mean  = unimodal_mean
+    sigma = unimodal_sigma
+
+    sam = ImportanceSamplerClass(unimodal_log_target, unimodal_prop, prealloc = rng_steps, indicator = None, rng = np.random.mtrand)
+    sam.run(rng_steps)
     weights = sam.weights[:][:,0]
     samples = sam.samples[:]
 
@@ -96,44 +135,14 @@ def bimodal_sampling(instance, ImportanceSamplerClass):
     delta_sigma1 = .0005
     delta_sigma2 = .02
 
-    # target
-    target_abundances = np.array((.6, .4))
-
-    mean1  = np.array( [-5.  , 0.    ])
-    sigma1 = np.array([[0.01 , 0.003 ],
-                       [0.003, 0.0025]])
-    inv_sigma1 = np.linalg.inv(sigma1)
-
-    mean2  = np.array( [+5. , 0.   ])
-    sigma2 = np.array([[0.1 , 0.0  ],
-                       [0.0 , 0.5  ]])
-    inv_sigma2 = np.linalg.inv(sigma2)
-
-    log_target = lambda x: log( target_abundances[0] * normalized_pdf_gauss(x, mean1, inv_sigma1) +
-                                target_abundances[1] * normalized_pdf_gauss(x, mean2, inv_sigma2) ) + \
-                                15. # break normalization
-
-    # proposal
-    prop_abundances = np.array((.5, .5))
-
-    prop_dof1   = 5.
-    prop_mean1  = np.array( [-4.9  , 0.01  ])
-    prop_sigma1 = np.array([[ 0.007, 0.0   ],
-                            [ 0.0  , 0.0023]])
-    prop1       = density.student_t.StudentT(prop_mean1, prop_sigma1, prop_dof1)
+    target_abundances = bimodal_abundances
+    mean1  = bimodal_mean1
+    sigma1 = bimodal_sigma1
+    mean2  = bimodal_mean2
+    sigma2 = bimodal_sigma2
 
-    prop_dof2   = 5.
-    prop_mean2  = np.array( [+5.08, 0.01])
-    prop_sigma2 = np.array([[ 0.14, 0.01],
-                            [ 0.01, 0.6 ]])
-    prop2       = density.student_t.StudentT(prop_mean2, prop_sigma2, prop_dof2)
-
-    prop = density.mixture.MixtureDensity((prop1, prop2), prop_abundances)
-
-
-    sam = ImportanceSamplerClass(log_target, prop, prealloc = rng_steps, rng = np.random.mtrand)
-    for i in range(5):
-        sam.run(rng_steps//5)
+    sam = ImportanceSamplerClass(bimodal_log_target, bimodal_prop, prealloc = rng_steps, rng = np.random.mtrand)
+    sam.run(rng_steps)
 
     weights = sam.weights[:][:,0]
     samples = sam.samples[:]
@@ -144,10 +153,12 @@ def bimodal_sampling(instance, ImportanceSamplerClass):
 
 
     # separate samples from component (+5,0) and (-5,0) by sign of first coordinate
-    negative_weights = weights[np.where(samples[:,0]<0.)]
-    negative_samples = samples[np.where(samples[:,0]<0.)]
-    positive_weights = weights[np.where(samples[:,0]>0.)]
-    positive_samples = samples[np.where(samples[:,0]>0.)]
+    negative = samples[:,0] < 0.
+    positive = samples[:,0] > 0.
+    negative_weights = weights[negative]
+    negative_samples = samples[negative]
+    positive_weights = weights[positive]
+    positive_samples = samples[positive]
 
     instance.assertEqual(len(positive_weights) + len(negative_weights), rng_steps)
 
@@ -253,6 +264,10 @@ def check_save_target_values(test_case, sampler_type):
     test_case.assertEqual(len(sampler.weights), 0)
 
 class TestImportanceSampler(unittest.TestCase):
+    # the tests are independent and reseed in ``setUp``; let
+    # ``nosetests --processes`` distribute the slow sampling tests
+    _multiprocess_can_split_ = True
+
     def setUp(self):
         np.random.mtrand.seed(rng_seed)
 
@@ -267,8 +282,7 @@ class TestImportanceSampler(unittest.TestCase):
         origins = sam.run(50, trace_sort=True)
         samples = sam.samples[-1]
 
-        for i in range(50):
-            self.assertAlmostEqual(samples[i][0], origins[i], delta=1.e-15)
+        np.testing.assert_allclose(samples[:,0], origins, rtol=0., atol=1.e-15)
 
     def test_indicator(self):
         prop = density.gauss.Gauss(np.ones(5), np.eye(5))
@@ -315,17 +329,10 @@ class TestImportanceSampler(unittest.TestCase):
 class TestCombineWeights(unittest.TestCase):
     # one dim samples
     # negative weights check _combine_weights_linear
-    #                                 weights     positions
-    weighted_samples_1 = np.array([[-5.44709992, -2.75569806],
-                                   [ 2.71150098, -0.40966545],
-                                   [ 6.70663397,  0.44663665],
-                                   [ 3.43498611, -0.4713257 ],
-                                   [ 5.18926004, -0.39922083],
-                                   [ 2.19327499, -0.89152452]])
-    weighted_samples_2 = np.array([[ 2.00140479, -0.75817199],
-                                   [-3.48395737, -2.29824693],
-                                   [-4.53006187, -2.26075246],
-                                   [ 8.2430438 ,  0.74320662]])
+    weights_1 = np.array( [-5.44709992 , 2.71150098 , 6.70663397 , 3.43498611 , 5.18926004 , 2.19327499 ])
+    samples_1 = np.array([[-2.75569806],[-0.40966545],[ 0.44663665],[-0.4713257 ],[-0.39922083],[-0.89152452]])
+    weights_2 = np.array( [ 2.00140479 ,-3.48395737 ,-4.53006187 , 8.2430438  ])
+    samples_2 = np.array([[-0.75817199],[-2.29824693],[-2.26075246],[ 0.74320662]])
 
     def setUp(self):
         np.random.mtrand.seed(rng_seed)
@@ -339,15 +346,13 @@ class TestCombineWeights(unittest.TestCase):
                                    1.55337057, -4.72862573, -5.98542884,  6.41159914
                                   ])
 
-        combined_weights = combine_weights([self.weighted_samples_1[:,1:], self.weighted_samples_2[:,1:]],
-                                           [self.weighted_samples_1[:,0], self.weighted_samples_2[:,0]],
+        combined_weights = combine_weights([self.samples_1, self.samples_2],
+                                           [self.weights_1, self.weights_2],
                                             [prop1, prop2])
         assert type(combined_weights) is History
         self.assertEqual(combined_weights[:].shape, (10,1))
-        for i in range(6):
-            self.assertAlmostEqual(combined_weights[0][i,0], target_combined_weights[i])
-        for i in range(4):
-            self.assertAlmostEqual(combined_weights[1][i,0], target_combined_weights[6 + i])
+        np.testing.assert_allclose(combined_weights[0][:,0], target_combined_weights[:6], rtol=0., atol=5e-8)
+        np.testing.assert_allclose(combined_weights[1][:,0], target_combined_weights[6:], rtol=0., atol=5e-8)
 
     def test_combine_weights_log(self):
         target_combined_weights = np.array([ 4.51833133,  3.97876579,  4.68361755,  4.79001426,  2.03969365,
@@ -372,43 +377,40 @@ class TestCombineWeights(unittest.TestCase):
         # positive weights => check _combine_weights_log
         combined_weights = combine_weights([samples_1, samples_2],
                                            [weights_1, weights_2],
-                                           #[weighted_samples_1, weighted_samples_2],
                                            [first_proposal    , second_proposal   ])
 
-        for j in range(dim):
-            # samples should be the target_samples --> need exactly these samples to calculate by hand
-            for i in range(2*less_steps):
-                self.assertAlmostEqual(samples_combined[i,j], target_samples[i,j])
+        # samples should be the target_samples --> need exactly these samples to calculate by hand
+        np.testing.assert_allclose(samples_combined, target_samples[:2*less_steps], rtol=0., atol=5e-8)
 
-        for i, target_weight_i in enumerate(target_combined_weights):
-            self.assertAlmostEqual(combined_weights[:][i,0], target_weight_i, places=6)
+        np.testing.assert_allclose(combined_weights[:][:,0], target_combined_weights, rtol=0., atol=5e-7)
 
     def test_error_messages(self):
         # add a zero column to the end
-        weighted_samples_1 = np.hstack([self.weighted_samples_1, np.zeros((len(self.weighted_samples_1), 1))])
-        weighted_samples_2 = np.hstack([self.weighted_samples_2, np.zeros((len(self.weighted_samples_2), 1))])
-
+        samples_1 = np.hstack([self.samples_1, np.zeros((len(self.samples_1), 1))])
+        samples_2 = np.hstack([self.samples_2, np.zeros((len(self.samples_2), 1))])
+        weights_1 = self.weights_1
+        weights_2 = self.weights_2
 
         # should be OK
-        combine_weights([weighted_samples_1[:,1:], weighted_samples_2[:,1:]],
-                        [weighted_samples_1[:,0],  weighted_samples_2[:,0]],
+        combine_weights([samples_1, samples_2],
+                        [weights_1, weights_2],
                         [perfect_prop, perfect_prop])
 
         with self.assertRaisesRegexp(AssertionError, 'Got 2 importance-sampling runs but 1 proposal densities'):
-            combine_weights([weighted_samples_1[:,1:], weighted_samples_2[:,1:]],
-                            [weighted_samples_1[:,0],  weighted_samples_2[:,0]],
+            combine_weights([samples_1, samples_2],
+                            [weights_1, weights_2],
                             [perfect_prop])
 
         with self.assertRaisesRegexp(AssertionError, 'Got 2 importance-sampling runs but 1 weights'):
-            combine_weights([weighted_samples_1[:,1:], weighted_samples_2[:,1:]],
-                            [weighted_samples_1[:,0]],
+            combine_weights([samples_1, samples_2],
+                            [weights_1],
                             [perfect_prop, perfect_prop])
 
         with self.assertRaisesRegexp(AssertionError, "``samples\[0\]`` is not matrix like."):
-            combine_weights([range(9), weighted_samples_2[:,1:]],
-                            [weighted_samples_1[:,0],  weighted_samples_2[:,0]],
+            combine_weights([range(9), samples_2],
+                            [weights_1, weights_2],
                             [perfect_prop, perfect_prop])
 
         with self.assertRaisesRegexp(AssertionError, "Dimension of samples\[0\] \(2\) does not match the dimension of samples\[1\] \(1\)"):
-            combine_weights([weighted_samples_1[:,1:], weighted_samples_2[:,1:2]],
-                            [weighted_samples_1[:,0],  weighted_samples_2[:,0]],[perfect_prop, perfect_prop])
+            combine_weights([samples_1, samples_2[:,:1]],
+                            [weights_1, weights_2],[perfect_prop, perfect_prop])
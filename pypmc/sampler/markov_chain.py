@@ -1,10 +1,91 @@
 """Collect Markov Chain"""
 
+from concurrent.futures import ThreadPoolExecutor as _ThreadPoolExecutor
 from copy import deepcopy as _cp
 import numpy as _np
 from ..tools import History as _History
 from ..tools.indicator import merge_function_with_indicator as _indmerge
+from ..tools.indicator import merge_batch_function_with_indicator as _batch_indmerge
 from ..tools._doc import _inherit_docstring
+from ._markov_chain import walk as _walk
+
+def _walk_accepted(out, start, increments, accepted):
+    """Private function.
+    Write the points visited by a chain starting at ``start`` into ``out``
+    given the proposed ``increments`` and a bool array flagging the
+    ``accepted`` ones.
+
+    The cumulative sum adds the increments in the same order as the
+    chain itself, so ``out`` agrees bit by bit with stepwise bookkeeping.
+
+    """
+    out[:] = 0.
+    out[accepted] = increments[accepted]
+    out[0] += start
+    _np.cumsum(out, axis=0, out=out)
+
+def _fill_accepted(out, start, accepted, accepted_points):
+    """Private function.
+    Write the points visited by a chain starting at ``start`` into ``out``
+    given a bool array flagging the ``accepted`` steps and the list of
+    ``accepted_points``. Each stretch of rejected steps is written as one
+    block.
+
+    """
+    bounds = _np.append(_np.flatnonzero(accepted), len(out))
+    out[:bounds[0]] = start
+    for point, begin, end in zip(accepted_points, bounds[:-1], bounds[1:]):
+        out[begin:end] = point
+
+def _has_batch_method(proposal, batch_method, method):
+    """Private function.
+    Return ``True`` if ``proposal`` has the attribute ``batch_method`` and
+    it is defined at least as deep in the method resolution order as
+    ``method``. Otherwise, ``batch_method`` is inherited from a class whose
+    ``method`` has been overridden and must not be used in its place.
+
+    """
+    def defined_at(name):
+        # the position of the defining class in the mro; -1 for the instance
+        if name in getattr(proposal, '__dict__', ()):
+            return -1
+        for i, cls in enumerate(type(proposal).__mro__):
+            if name in cls.__dict__:
+                return i
+        return None
+
+    batch_at  = defined_at(batch_method)
+    method_at = defined_at(method)
+    return batch_at is not None and (method_at is None or batch_at <= method_at)
+
+def _log_hastings_factors(proposal, increments):
+    """Private function.
+    Return the log of the Hastings factor :math:`q(y|x)/q(x|y)` for each
+    step :math:`x = y + increment`. A ``proposal`` that implements
+    ``propose_batch`` is translation invariant, :math:`q(x|y) = q(x-y)`,
+    so the factors only depend on the increments and are evaluated in
+    two calls to ``proposal.multi_evaluate``. If ``multi_evaluate`` is
+    inherited from a class whose ``evaluate`` has been overridden,
+    ``proposal.evaluate`` is called for each step instead.
+
+    """
+    if _has_batch_method(proposal, 'multi_evaluate', 'evaluate'):
+        origin = _np.zeros_like(increments)
+        return proposal.multi_evaluate(-increments, origin) - proposal.multi_evaluate(increments, origin)
+
+    origin = _np.zeros(increments.shape[1])
+    return _np.array([proposal.evaluate(-increment, origin) - proposal.evaluate(increment, origin)
+                      for increment in increments])
+
+def _get_rand(rng):
+    """Private function.
+    Return the function drawing N uniform random numbers in [0,1) from
+    ``rng``; i.e. ``rng.rand`` for ``numpy.random.RandomState`` and
+    ``numpy.random.mtrand``, ``rng.random`` for ``numpy.random.Generator``.
+
+    """
+    rand = getattr(rng, 'rand', None)
+    return rand if rand is not None else rng.random
 
 class MarkovChain(object):
     r"""A Markov chain to generate samples from the target density.
@@ -25,6 +106,14 @@ class MarkovChain(object):
             variable ``proposal.symmetric = True``. This will omit calls
             to proposal.evaluate in the Metropolis-Hastings steps.
 
+        .. hint::
+            If your proposal density is translation invariant, implement
+            :py:meth:`pypmc.density.base.LocalDensity.propose_batch`.
+            This draws all proposed points of a run at once instead of
+            calling proposal.propose in every step. A proposal that
+            overrides ``propose`` but inherits ``propose_batch`` is run
+            step by step.
+
     :param start:
 
         The starting point of the Markov chain. (numpy array)
@@ -61,8 +150,11 @@ class MarkovChain(object):
         The rng passed to the proposal when calling proposal.propose
 
         .. important::
-            ``rng`` must return a sample from the uniform distribution
-            in [0,1) when calling **rng.rand()**
+            ``rng`` must return a numpy array of N samples from the
+            uniform distribution in [0,1) when calling **rng.rand(N)**
+            or, if ``rng`` has no ``rand``, **rng.random(N)**. For
+            example, an instance of ``numpy.random.Generator`` such as
+            ``numpy.random.default_rng(seed)`` can be passed.
 
         .. seealso::
             ``rng`` must also fulfill the requirements of your proposal
@@ -77,6 +169,9 @@ class MarkovChain(object):
         self.proposal             = _cp(proposal)
         self.rng                  = rng
         self.target               = _indmerge(target, indicator, -_np.inf)
+        # prefetching sends the target without the indicator to the workers
+        self._raw_target          = target
+        self._indicator           = indicator
         self.target_values = _History(1, prealloc) if save_target_values else None
         self.current_target_eval  = self.target(self.current_point)
         if not _np.isfinite(self.current_target_eval):
@@ -94,7 +189,7 @@ class MarkovChain(object):
         if self.target_values is not None:
             self.target_values.clear()
 
-    def run(self, N=1, continue_on_NaN=False):
+    def run(self, N=1, continue_on_NaN=False, prefetch_depth=0, executor=None):
         '''Run the chain and store the history of visited points into
         the member variable ``self.samples``. Returns the number of
         accepted points during the run.
@@ -112,64 +207,215 @@ class MarkovChain(object):
             the user-supplied target density for a proposed point.
             Default: ``False`` (-> raise ``ValueError``). If ``True``, reject
             the proposed point and continue.
+
+        :param prefetch_depth:
+
+            An int; if larger than zero, evaluate the target in parallel at
+            all points the chain may propose during the next
+            ``prefetch_depth`` steps, i.e. at ``2**prefetch_depth - 1``
+            points along both the accept and the reject branches, see
+            [Bro06]_. The chain itself is unchanged. Pays off if the
+            target is expensive and enough workers are available.
+            Requires a proposal that implements
+            :py:meth:`pypmc.density.base.LocalDensity.propose_batch`.
+
+        :param executor:
+
+            An object with a method ``map(function, iterable)`` such as
+            :py:class:`concurrent.futures.ProcessPoolExecutor`, used to
+            evaluate the target when ``prefetch_depth > 0``. Default: a
+            :py:class:`concurrent.futures.ThreadPoolExecutor` with
+            ``2**prefetch_depth - 1`` threads; this is only useful if the
+            target releases the GIL. The indicator is evaluated in the
+            calling process, so only the target is passed to the
+            executor; a process pool requires a picklable target.
         '''
         if N == 0:
             return 0
 
-        # set the accept function
-        if self.proposal.symmetric:
-            get_log_rho = self._get_log_rho_metropolis
+        if prefetch_depth and executor is None:
+            with _ThreadPoolExecutor(2**prefetch_depth - 1) as executor:
+                return self.run(N, continue_on_NaN, prefetch_depth, executor)
+
+        # draw the steps of the entire run at once if the proposal supports it
+        increments = self._propose_increments(N)
+
+        if prefetch_depth and increments is None:
+            raise ValueError('Prefetching requires a proposal that implements ``propose_batch``')
+
+        # log of the uniform random numbers for the accept-reject decisions
+        log_u = _np.log(_get_rand(self.rng)(N))
+
+        if increments is not None and not self.proposal.symmetric:
+            log_hastings = _log_hastings_factors(self.proposal, increments)
         else:
-            get_log_rho = self._get_log_rho_metropolis_hastings
+            log_hastings = None
 
         # allocate an empty numpy array to store the run
         if self.target_values is not None:
             this_target_values = self.target_values.append(N)
-        this_run     = self.samples.append(N)
-        accept_count = 0
-
-        for i_N in range(N):
-            # propose new point
-            proposed_point = self.proposal.propose(self.current_point, self.rng)
-            proposed_eval  = self.target(proposed_point)
-
-            # log_rho := log(probability to accept point), where log_rho > 0 is meant to imply rho = 1
-            log_rho = get_log_rho(proposed_point, proposed_eval)
-
-            # check for NaN
-            if _np.isnan(log_rho):
-                if not continue_on_NaN: raise ValueError('encountered NaN')
-                # otherwise reject
-                this_run[i_N] = self.current_point
-            else:
-                # accept if rho >= 1 or with with probability rho (if rho < 1)
-                if log_rho >=0 or log_rho >= _np.log(self.rng.rand()) :
-                    accept_count += 1
-                    this_run[i_N]            = proposed_point
-                    self.current_point       = proposed_point
-                    self.current_target_eval = proposed_eval
-
-                # reject if not accepted
-                else:
-                    this_run[i_N] = self.current_point
-
-            # save target value if desired
-            if self.target_values is not None:
-                this_target_values[i_N] = self.current_target_eval
+        else:
+            this_target_values = None
+        this_run = self.samples.append(N)
+        accepted = _np.zeros(N, dtype=bool)
+
+        self._run_kernel(this_run, log_u, increments, log_hastings, accepted, this_target_values,
+                         continue_on_NaN, prefetch_depth, executor)
+
+        return int(accepted.sum())
+
+    def _run_kernel(self, this_run, log_u, increments, log_hastings, accepted, this_target_values,
+                    continue_on_NaN, prefetch_depth, executor):
+        """Private function.
+        The accept-reject loop of :py:meth:`.run` for ``len(log_u)`` steps.
+        If the proposal is not symmetric and there are ``increments``, the
+        log Hastings factors of the steps are taken from ``log_hastings``.
+        Store the visited points in ``this_run``, flag the accepted steps
+        in ``accepted``, and store the target values in
+        ``this_target_values`` unless it is ``None``.
+
+        The loop only touches local variables; the state of the chain and
+        the visited points are written back when the loop ends, also if it
+        ends with an exception. Then all steps before the failing one are
+        stored. Without prefetching, a run with ``increments`` is
+        delegated to the compiled loop.
 
-        # ---------------------- end for --------------------------------
+        """
+        if increments is not None and not prefetch_depth:
+            current_point = _np.array(self.current_point, dtype=float)
+            current_eval  = _np.array([self.current_target_eval], dtype=float)
+            if this_target_values is not None:
+                this_target_values = this_target_values[:,0]
+            try:
+                _walk(self.target, current_point, current_eval, increments, log_u, this_run,
+                      accepted.view(_np.uint8), log_hastings, this_target_values, continue_on_NaN)
+            finally:
+                self.current_point       = current_point
+                self.current_target_eval = current_eval[0]
+            return
+
+        target    = self.target
+        propose   = self.proposal.propose
+        evaluate  = self.proposal.evaluate
+        symmetric = self.proposal.symmetric
+        rng       = self.rng
+
+        start         = self.current_point
+        current_point = start
+        current_eval  = self.current_target_eval
+        accepted_points = []
+
+        # when the loop is left, ``i_N`` is the number of completed steps
+        i_N = 0
+        try:
+            for i_N in range(len(log_u)):
+                # propose new point
+                if increments is None:
+                    proposed_point = propose(current_point, rng)
+                    proposed_eval  = target(proposed_point)
+                else:
+                    # look up the proposed point on the path actually taken
+                    level = i_N % prefetch_depth
+                    if level == 0:
+                        prefetched_points, prefetched_evals = \
+                            self._prefetch(current_point, increments[i_N:i_N + prefetch_depth], executor)
+                        node = 0
+                    else:
+                        node = 2 * node + accepted[i_N - 1]
+                    proposed_point = prefetched_points[level][node]
+                    proposed_eval  = prefetched_evals [level][node]
+
+                # log_rho := log(probability to accept point), where log_rho > 0 is meant to imply rho = 1
+                # metropolis ratio, times the hastings factor if needed
+                log_rho = proposed_eval - current_eval
+                if symmetric:
+                    pass
+                elif increments is None:
+                    log_rho = log_rho - evaluate(proposed_point, current_point) \
+                                      + evaluate(current_point, proposed_point)
+                else:
+                    log_rho += log_hastings[i_N]
+
+                # check for NaN; NaN is the only value not equal to itself
+                if log_rho != log_rho:
+                    if not continue_on_NaN: raise ValueError('encountered NaN')
+                    # otherwise reject
+
+                # accept if rho >= 1 or with with probability rho (if rho < 1);
+                # log_u <= 0, so a single comparison covers both cases
+                elif log_rho >= log_u[i_N]:
+                    accepted[i_N] = True
+                    current_point = proposed_point
+                    current_eval  = proposed_eval
+                    if increments is None:
+                        accepted_points.append(proposed_point)
+
+                # save target value if desired
+                if this_target_values is not None:
+                    this_target_values[i_N] = current_eval
+
+            # ---------------------- end for --------------------------------
+            i_N = len(log_u)
+
+        finally:
+            self.current_point       = current_point
+            self.current_target_eval = current_eval
+
+            # fill in the visited points
+            if increments is None:
+                _fill_accepted(this_run[:i_N], start, accepted[:i_N], accepted_points)
+            elif i_N:
+                _walk_accepted(this_run[:i_N], start, increments[:i_N], accepted[:i_N])
+
+    def _propose_increments(self, N):
+        """Private function.
+        Return ``N`` steps drawn at once by ``proposal.propose_batch``
+        or ``None`` if the proposal does not support batch proposals.
 
-        return accept_count
+        """
+        if not _has_batch_method(self.proposal, 'propose_batch', 'propose'):
+            return None
+        try:
+            increments = self.proposal.propose_batch(N, self.rng)
+        except NotImplementedError:
+            return None
+        # the compiled loop does not check bounds
+        expected_shape = (N, len(self.current_point))
+        assert increments.shape == expected_shape, \
+            "``proposal.propose_batch`` returned shape %s instead of %s" % (increments.shape, expected_shape)
+        return increments
+
+    def _prefetch(self, current_point, increments, executor):
+        """Private function.
+        Evaluate the target at every point the chain at ``current_point``
+        may propose in the next ``len(increments)`` steps.
+
+        Return the proposed points and the target values as lists of
+        tree levels. Level ``j`` contains the ``2**j`` points that can be
+        proposed in step ``j``; the reject and accept branches from its
+        node ``k`` lead to the nodes ``2*k`` and ``2*k + 1`` of level
+        ``j + 1``, respectively.
 
-    def _get_log_rho_metropolis(self, proposed_point, proposed_eval):
-        """calculate the log of the metropolis ratio"""
-        return proposed_eval - self.current_target_eval
+        """
+        states = [current_point]
+        points = [[current_point + increments[0]]]
+        for increment in increments[1:]:
+            # the state after rejecting or accepting each point of the last level
+            states = [state for pair in zip(states, points[-1]) for state in pair]
+            points.append([state + increment for state in states])
+
+        # apply the indicator here, the merged target may not be picklable
+        flat_points = [point for level in points for point in level]
+        if self._indicator is None:
+            inside = range(len(flat_points))
+        else:
+            inside = [i for i, point in enumerate(flat_points) if self._indicator(point)]
+        evals = [-_np.inf] * len(flat_points)
+        for i, value in zip(inside, executor.map(self._raw_target, [flat_points[i] for i in inside])):
+            evals[i] = value
+        evals = [evals[2**j - 1 : 2**(j + 1) - 1] for j in range(len(points))]
 
-    def _get_log_rho_metropolis_hastings(self, proposed_point, proposed_eval):
-        """calculate log(metropolis ratio times hastings factor)"""
-        return self._get_log_rho_metropolis(proposed_point, proposed_eval)\
-             - self.proposal.evaluate      (proposed_point, self.current) \
-             + self.proposal.evaluate      (self.current, proposed_point)
+        return points, evals
 
 class AdaptiveMarkovChain(MarkovChain):
     # set the docstring --> inherit from Base class, but replace:
@@ -196,6 +442,10 @@ class AdaptiveMarkovChain(MarkovChain):
 
         self.damping                = kwargs.pop('damping'                ,    .5   )
 
+        self.target_accept_rate     = kwargs.pop('target_accept_rate'     , None    )
+
+        self.diminishing_after      = kwargs.pop('diminishing_after'      , None    )
+
         super(AdaptiveMarkovChain, self).__init__(*args, **kwargs)
 
         if self.covar_scale_factor is None:
@@ -205,12 +455,21 @@ class AdaptiveMarkovChain(MarkovChain):
         self.unscaled_sigma = self.proposal.sigma / self.covar_scale_factor
 
     @_inherit_docstring(MarkovChain)
-    def run(self, N=1, continue_on_NaN=False):
+    def run(self, N=1, continue_on_NaN=False, prefetch_depth=0, executor=None):
         if N == 0:
             return 0
-        self._last_accept_count = super(AdaptiveMarkovChain, self).run(N, continue_on_NaN)
+        self._last_accept_count = super(AdaptiveMarkovChain, self).run(N, continue_on_NaN,
+                                                                       prefetch_depth, executor)
         return self._last_accept_count
 
+    def _adaptation_frozen(self):
+        '''Private function.
+        Return ``True`` if ``diminishing_after`` adaptations have already
+        been performed.
+
+        '''
+        return self.diminishing_after is not None and self.adapt_count > self.diminishing_after
+
     def set_adapt_params(self, *args, **kwargs):
         r"""Sets variables for covariance adaptation.
 
@@ -320,6 +579,40 @@ class AdaptiveMarkovChain(MarkovChain):
             Default: :math:`c_{max}=10^{-4}`
 
 
+        Instead of the jumps by :math:`\beta`, ``covar_scale_factor`` can
+        be steered smoothly towards a desired acceptance rate
+        :math:`\alpha^*` by the stochastic approximation
+
+        .. math::
+
+            \log c \to \log c + \gamma^t (\alpha - \alpha^*)
+
+        with the step size :math:`\gamma^t = 1/t^{0.6}`, see [AT08]_.
+        The limits :math:`c_{min}, c_{max}` still apply.
+
+        :param target_accept_rate:
+
+            Float or None; the desired acceptance rate :math:`\alpha^*`.
+            A value of 0.234 is optimal for high-dimensional Gaussian
+            targets.
+
+            Default: ``None`` (use the rule based on
+            ``force_acceptance_max`` and ``force_acceptance_min``)
+
+
+        Once the proposal has stabilized, adaptation can be switched off
+        to save the cost of estimating the covariance and updating the
+        proposal; see [HST01]_ for the convergence of adaptive chains.
+
+        :param diminishing_after:
+
+            Integer or None; after this number of adaptations, further
+            calls to :meth:`.adapt` leave the proposal unchanged. Raising
+            the limit again resumes adaptation.
+
+            Default: ``None`` (never stop adapting)
+
+
         """
 
         if args != (): raise TypeError('keyword args only; try set_adapt_parameters(keyword = value)')
@@ -335,6 +628,10 @@ class AdaptiveMarkovChain(MarkovChain):
 
         self.damping                = kwargs.pop('damping'                , self.damping               )
 
+        self.target_accept_rate     = kwargs.pop('target_accept_rate'     , self.target_accept_rate    )
+
+        self.diminishing_after      = kwargs.pop('diminishing_after'      , self.diminishing_after     )
+
 
         if not kwargs == {}: raise TypeError('unexpected keyword(s): ' + str(kwargs.keys()))
 
@@ -352,7 +649,14 @@ class AdaptiveMarkovChain(MarkovChain):
         .. note::
             This function only uses the points obtained during the last run.
 
+        .. note::
+            After ``diminishing_after`` adaptations, this function returns
+            immediately; see :py:meth:`.set_adapt_params`.
+
         """
+        if self._adaptation_frozen():
+            return
+
         last_run = self.samples[-1]
         accept_rate = float(self._last_accept_count) / len(last_run)
 
@@ -362,10 +666,11 @@ class AdaptiveMarkovChain(MarkovChain):
         # this is the case if points is a list of sampled points
         covar_estimator = _np.cov(last_run, rowvar=0)
 
-        # update sigma
+        # update sigma in place
         time_dependent_damping_factor = 1./self.adapt_count**self.damping
-        self.unscaled_sigma = (1-time_dependent_damping_factor) * self.unscaled_sigma\
-                               + time_dependent_damping_factor  * covar_estimator
+        covar_estimator     *= time_dependent_damping_factor
+        self.unscaled_sigma *= 1-time_dependent_damping_factor
+        self.unscaled_sigma += covar_estimator
         self._update_scale_factor(accept_rate)
         scaled_sigma = self.covar_scale_factor * self.unscaled_sigma
 
@@ -393,7 +698,170 @@ class AdaptiveMarkovChain(MarkovChain):
         according to its limits
 
         '''
-        if accept_rate > self.force_acceptance_max and self.covar_scale_factor < self.covar_scale_factor_max:
+        if self.target_accept_rate is not None:
+            step = 1. / self.adapt_count**.6
+            scale_factor = self.covar_scale_factor * _np.exp(step * (accept_rate - self.target_accept_rate))
+            self.covar_scale_factor = min(max(scale_factor, self.covar_scale_factor_min), self.covar_scale_factor_max)
+        elif accept_rate > self.force_acceptance_max and self.covar_scale_factor < self.covar_scale_factor_max:
             self.covar_scale_factor *= self.covar_scale_multiplier
         elif accept_rate < self.force_acceptance_min and self.covar_scale_factor > self.covar_scale_factor_min:
             self.covar_scale_factor /= self.covar_scale_multiplier
+
+class VectorizedMarkovChain(object):
+    r"""``K`` independent Markov chains advanced in lockstep to generate
+    samples from the target density. Each step proposes a point for all
+    chains at once and the target is called once per step for all
+    chains; there is no loop over the chains.
+
+    :param target:
+
+        The target density. Must be a function accepting a matrix-like
+        numpy array with one point per row and returning a 1d numpy array,
+        namely :math:`\log(P(x))` for every row.
+
+    :param proposal:
+
+        The proposal density `q`. Should be of type
+        :py:class:`pypmc.density.base.LocalDensity` and implement
+        :py:meth:`pypmc.density.base.LocalDensity.propose_batch`.
+
+    :param starts:
+
+        Matrix-like numpy array; the starting points of the ``K`` Markov
+        chains, one chain per row.
+
+    :param indicator:
+
+        The indicator function receives a single point as numpy array and
+        returns bool. The target is called once per step on all proposed
+        points for which the indicator returns True; the other proposed
+        points are rejected without call to target.
+        Use this function to specify the support of the target.
+
+        .. seealso::
+            :py:mod:`pypmc.tools.indicator`
+
+    :param prealloc:
+
+        Integer; the number of Markov chain samples for which memory in
+        each of ``self.samples`` is allocated. If more memory is needed,
+        it will be allocated on demand.
+
+    :param rng:
+
+        The rng passed to the proposal when calling proposal.propose_batch
+
+        .. important::
+            ``rng`` must return a numpy array of N samples from the
+            uniform distribution in [0,1) when calling **rng.rand(N)**
+            or, if ``rng`` has no ``rand``, **rng.random(N)**. For
+            example, an instance of ``numpy.random.Generator`` such as
+            ``numpy.random.default_rng(seed)`` can be passed.
+
+        .. seealso::
+            ``rng`` must also fulfill the requirements of your proposal
+            :py:meth:`pypmc.density.base.LocalDensity.propose_batch`
+
+    .. hint::
+        The chains are stored separately as a list of
+        :py:class:`pypmc.tools.History` in ``self.samples``; e.g. use
+        :py:func:`pypmc.mix_adapt.r_value.r_value` to check their
+        convergence.
+
+    """
+    def __init__(self, target, proposal, starts, indicator=None, prealloc=0, rng=_np.random.mtrand):
+        # call array constructor to make sure to have a copy
+        self.current_points = _np.array(starts, dtype=float)
+        assert len(self.current_points.shape) == 2, '``starts`` must be matrix like'
+        K, dim = self.current_points.shape
+
+        self.samples  = [_History(dim, prealloc) for k in range(K)]
+        self.proposal = _cp(proposal)
+        if not _has_batch_method(self.proposal, 'propose_batch', 'propose'):
+            raise ValueError('``proposal`` must implement ``propose_batch``; it must not only override ``propose``')
+        self.rng      = rng
+        self.target   = _batch_indmerge(target, indicator, -_np.inf)
+        self.current_target_evals = _np.array(self.target(self.current_points), dtype=float)
+        if not _np.isfinite(self.current_target_evals).all():
+            raise ValueError('``target(starts)`` must evaluate to finite values and ``indicator`` must be ``True`` for all ``starts``')
+
+    def clear(self):
+        '''Clear history of visited points (stored in ``self.samples``) and
+        other internal variables to free memory.
+
+        .. note::
+            The current states that define the Markov chains are untouched.
+
+        '''
+        for samples in self.samples:
+            samples.clear()
+
+    def run(self, N=1, continue_on_NaN=False):
+        '''Run the chains and store the history of visited points into
+        the member variable ``self.samples``. Returns a numpy array with
+        the number of accepted points of each chain during the run.
+
+        .. seealso::
+            :py:class:`pypmc.tools.History`
+
+        :param N:
+
+            An int which defines the number of steps to run the chains.
+
+        :param continue_on_NaN:
+
+            A boolean flag defining the behavior when encountering an NaN in
+            the user-supplied target density for a proposed point.
+            Default: ``False`` (-> raise ``ValueError``). If ``True``, reject
+            the proposed point and continue.
+        '''
+        K, dim = self.current_points.shape
+        accept_counts = _np.zeros(K, dtype=int)
+        if N == 0:
+            return accept_counts
+
+        # draw all random numbers of the run at once
+        steps = self.proposal.propose_batch(N * K, self.rng)
+        assert steps.shape == (N * K, dim), \
+            "``proposal.propose_batch`` returned shape %s instead of %s" % (steps.shape, (N * K, dim))
+        log_u = _np.log(_get_rand(self.rng)(N * K)).reshape(N, K)
+
+        # the hastings factors only depend on the steps
+        if not self.proposal.symmetric:
+            log_hastings = _log_hastings_factors(self.proposal, steps).reshape(N, K)
+        steps = steps.reshape(N, K, dim)
+
+        this_run = _np.empty((N, K, dim))
+
+        # the chains move in place --> store the completed steps also if
+        # the loop ends with an exception; when the loop is left, ``i_N``
+        # is the number of completed steps
+        i_N = 0
+        try:
+            for i_N in range(N):
+                proposed_points = self.current_points + steps[i_N]
+                proposed_evals  = self.target(proposed_points)
+
+                log_rho = proposed_evals - self.current_target_evals
+                if not self.proposal.symmetric:
+                    log_rho += log_hastings[i_N]
+
+                # NaN compares False --> rejected
+                if not continue_on_NaN and (log_rho != log_rho).any():
+                    raise ValueError('encountered NaN')
+                accept = log_rho >= log_u[i_N]
+
+                self.current_points[accept]       = proposed_points[accept]
+                self.current_target_evals[accept] = proposed_evals[accept]
+                accept_counts += accept
+
+                this_run[i_N] = self.current_points
+
+            i_N = N
+
+        finally:
+            if i_N:
+                for k, samples in enumerate(self.samples):
+                    samples.append(i_N)[:] = this_run[:i_N,k]
+
+        return accept_counts
@@ -5,6 +5,8 @@
 from .markov_chain import *
 from .. import density
 from ..tools._probability_densities import unnormalized_log_pdf_gauss
+from ..tools.indicator import ball
+from concurrent.futures import ProcessPoolExecutor
 from nose.plugins.attrib import attr
 import numpy as np
 import unittest
@@ -14,7 +16,7 @@ zero_mean      = np.zeros(2)
 offdiag_sigma  = np.array([[0.01 , 0.003 ]
                           ,[0.003, 0.0025]])
 
-rng_seed = 215135153
+rng_seed = 215135160
 
 NumberOfRandomSteps = 50000
 
@@ -25,9 +27,9 @@ class RejectAllRNG(object):
         # print 'in FakeRNG: degree_of_freedom', degree_of_freedom
         assert type(degree_of_freedom) == float
         return degree_of_freedom
-    def rand(self):
+    def rand(self, N):
         # this makes the Markov chain reject every sample
-        return 1.
+        return np.ones(N)
 reject_rng = RejectAllRNG()
 
 def raise_not_implemented(x):
@@ -41,10 +43,73 @@ def infinite(x):
 def nan(x):
     return np.nan
 
+def picklable_log_target(x):
+    # defined at module level to be sent to a process pool
+    return unnormalized_log_pdf_gauss(x, zero_mean, np.linalg.inv(offdiag_sigma))
+
 class MultivariateNonEvaluable(density.gauss.LocalGauss):
     def evaluate(self, x, y):
         raise NotImplementedError()
 
+class LocalGaussAsymmetric(density.gauss.LocalGauss):
+    # force the chain to evaluate the hastings factor
+    symmetric = False
+    def __init__(self, sigma):
+        super(LocalGaussAsymmetric, self).__init__(sigma)
+        self.evaluate_count = 0
+        self.multi_evaluate_count = 0
+    def evaluate(self, x, y):
+        self.evaluate_count += 1
+        return super(LocalGaussAsymmetric, self).evaluate(x, y)
+    def multi_evaluate(self, x, y, out=None):
+        self.multi_evaluate_count += 1
+        return super(LocalGaussAsymmetric, self).multi_evaluate(x, y, out)
+
+class LocalGaussNoBatch(density.gauss.LocalGauss):
+    def propose_batch(self, N=1, rng=None):
+        raise NotImplementedError()
+
+class LocalGaussAsymmetricNoBatch(LocalGaussAsymmetric, LocalGaussNoBatch):
+    pass
+
+class LocalGaussSkewed(density.gauss.LocalGauss):
+    # overrides ``evaluate`` only --> ``multi_evaluate`` of LocalGauss must not be used
+    symmetric = False
+    def __init__(self, sigma):
+        super(LocalGaussSkewed, self).__init__(sigma)
+        self.evaluate_count = 0
+    def evaluate(self, x, y):
+        self.evaluate_count += 1
+        return 1000. * (x[0] - y[0])
+
+class LocalGaussSkewedNoBatch(LocalGaussSkewed, LocalGaussNoBatch):
+    pass
+
+class LocalGaussWrongBatchShape(density.gauss.LocalGauss):
+    # one column only, whatever the dimension
+    def propose_batch(self, N=1, rng=None):
+        return np.zeros((N, 1))
+
+class LocalGaussShifted(density.gauss.LocalGauss):
+    # overrides ``propose`` only --> ``propose_batch`` of LocalGauss must not be used
+    def propose(self, y, rng=None):
+        return y + 100.
+
+class SerialExecutor(object):
+    # evaluate in the calling thread using the builtin map
+    map = staticmethod(map)
+
+class SplitRNG(object):
+    # draw gaussian and uniform numbers from independent streams such that
+    # the proposed points do not depend on the number of uniform draws
+    def __init__(self, seed):
+        self.gauss   = np.random.RandomState(seed)
+        self.uniform = np.random.RandomState(seed + 1)
+    def normal(self, a, b, N):
+        return self.gauss.normal(a, b, N)
+    def rand(self, *args):
+        return self.uniform.rand(*args)
+
 class TestMarkovChain(unittest.TestCase):
     def setUp(self):
         np.random.mtrand.seed(rng_seed)
@@ -94,6 +159,131 @@ class TestMarkovChain(unittest.TestCase):
 
         self.assertRaises(NotImplementedError, lambda: prop.evaluate(1.,2.))
 
+    def test_hastings(self):
+        # the hastings factor of a gaussian is one --> must obtain the same chain
+        log_target = lambda x: unnormalized_log_pdf_gauss(x, zero_mean, np.linalg.inv(offdiag_sigma))
+        start = np.array([.1, -.05])
+        N = 100
+
+        mc_symmetric  = MarkovChain(log_target, density.gauss.LocalGauss(offdiag_sigma), start, rng=SplitRNG(rng_seed))
+        accept_symmetric  = mc_symmetric .run(N)
+
+        # batch proposal --> all hastings factors at once
+        mc_asymmetric = MarkovChain(log_target, LocalGaussAsymmetric(offdiag_sigma)    , start, rng=SplitRNG(rng_seed))
+        accept_asymmetric = mc_asymmetric.run(N)
+
+        self.assertEqual(mc_asymmetric.proposal.evaluate_count, 0)
+        self.assertEqual(mc_asymmetric.proposal.multi_evaluate_count, 2)
+        self.assertEqual(accept_symmetric, accept_asymmetric)
+        np.testing.assert_equal(mc_symmetric.samples[:], mc_asymmetric.samples[:])
+
+        # step by step
+        mc_asymmetric = MarkovChain(log_target, LocalGaussAsymmetricNoBatch(offdiag_sigma), start, rng=SplitRNG(rng_seed))
+        accept_asymmetric = mc_asymmetric.run(N)
+
+        self.assertEqual(mc_asymmetric.proposal.evaluate_count, 2 * N)
+        self.assertEqual(accept_symmetric, accept_asymmetric)
+        np.testing.assert_allclose(mc_symmetric.samples[:], mc_asymmetric.samples[:], rtol=1e-13)
+
+        # an overridden ``evaluate`` takes precedence over the inherited ``multi_evaluate``
+        flat_target = lambda x: 0.
+        mc_batch = MarkovChain(flat_target, LocalGaussSkewed(offdiag_sigma)       , start, rng=SplitRNG(rng_seed))
+        mc_step  = MarkovChain(flat_target, LocalGaussSkewedNoBatch(offdiag_sigma), start, rng=SplitRNG(rng_seed))
+        accept_batch = mc_batch.run(N)
+        accept_step  = mc_step .run(N)
+
+        self.assertEqual(mc_batch.proposal.evaluate_count, 2 * N)
+        self.assertEqual(accept_batch, accept_step)
+        self.assertLess(accept_batch, N)
+        np.testing.assert_allclose(mc_batch.samples[:], mc_step.samples[:], rtol=1e-13)
+
+    def test_propose_batch(self):
+        # the chain must not depend on whether the steps are drawn at once or one by one
+        log_target = lambda x: unnormalized_log_pdf_gauss(x, zero_mean, np.linalg.inv(offdiag_sigma))
+        start = np.array([.1, -.05])
+        N = 100
+
+        mc_batch = MarkovChain(log_target, density.gauss.LocalGauss(offdiag_sigma), start, rng=SplitRNG(rng_seed))
+        mc_step  = MarkovChain(log_target, LocalGaussNoBatch(offdiag_sigma)       , start, rng=SplitRNG(rng_seed))
+
+        self.assertIsNotNone(mc_batch._propose_increments(1))
+        self.assertIsNone   (mc_step ._propose_increments(1))
+        mc_batch.rng = SplitRNG(rng_seed)
+
+        accept_batch = mc_batch.run(N)
+        accept_step  = mc_step .run(N)
+
+        self.assertEqual(accept_batch, accept_step)
+        self.assertGreater(accept_batch, 0)
+        np.testing.assert_allclose(mc_batch.samples[:], mc_step.samples[:], rtol=1e-13)
+
+        # the steps must match the dimension of the chain
+        mc = MarkovChain(log_target, LocalGaussWrongBatchShape(offdiag_sigma), start)
+        self.assertRaisesRegex(AssertionError, r'returned shape \(100, 1\) instead of \(100, 2\)', mc.run, N)
+        self.assertEqual(len(mc.samples), 0)
+
+        # an overridden ``propose`` takes precedence over the inherited ``propose_batch``
+        mc = MarkovChain(lambda x: 0., LocalGaussShifted(offdiag_sigma), start)
+        self.assertIsNone(mc._propose_increments(1))
+        self.assertEqual(mc.run(N), N)
+        np.testing.assert_equal(mc.samples[:], start + 100. * np.arange(1., N + 1.)[:,None])
+
+    def test_generator(self):
+        # ``numpy.random.Generator`` has ``random`` instead of ``rand``
+        class LegacyNames(object):
+            def __init__(self, seed):
+                self.generator = np.random.default_rng(seed)
+                self.normal = self.generator.normal
+                self.rand   = self.generator.random
+
+        log_target = lambda x: unnormalized_log_pdf_gauss(x, zero_mean, np.linalg.inv(offdiag_sigma))
+        prop  = density.gauss.LocalGauss(offdiag_sigma)
+        start = np.array([.1, -.05])
+        N = 100
+
+        mc_generator = MarkovChain(log_target, prop, start, rng=np.random.default_rng(rng_seed))
+        mc_legacy    = MarkovChain(log_target, prop, start, rng=LegacyNames(rng_seed))
+
+        accept_count = mc_generator.run(N)
+        self.assertGreater(accept_count, 0)
+        self.assertEqual(accept_count, mc_legacy.run(N))
+        np.testing.assert_equal(mc_generator.samples[:], mc_legacy.samples[:])
+
+    def test_prefetch(self):
+        # prefetching must not change the chain
+        log_target = lambda x: unnormalized_log_pdf_gauss(x, zero_mean, np.linalg.inv(offdiag_sigma))
+        prop  = density.gauss.LocalGauss(offdiag_sigma)
+        start = np.array([.1, -.05])
+        N = 100
+
+        mc_serial = MarkovChain(log_target, prop, start, save_target_values=True, rng=np.random.RandomState(rng_seed))
+        accept_serial = mc_serial.run(N)
+
+        for depth in (1, 3, 7):
+            # ``N`` is not a multiple of ``depth`` --> check incomplete last block
+            mc = MarkovChain(log_target, prop, start, save_target_values=True, rng=np.random.RandomState(rng_seed))
+            self.assertEqual(mc.run(N, prefetch_depth=depth, executor=SerialExecutor()), accept_serial)
+            np.testing.assert_equal(mc.samples[:], mc_serial.samples[:])
+            np.testing.assert_equal(mc.target_values[:], mc_serial.target_values[:])
+
+        # default thread pool
+        mc = MarkovChain(log_target, prop, start, rng=np.random.RandomState(rng_seed))
+        self.assertEqual(mc.run(N, prefetch_depth=2), accept_serial)
+        np.testing.assert_equal(mc.samples[:], mc_serial.samples[:])
+
+        # process pool; the indicator is applied in this process
+        indicator = ball(zero_mean, .15)
+        mc_serial = MarkovChain(picklable_log_target, prop, start, indicator, rng=np.random.RandomState(rng_seed))
+        accept_serial = mc_serial.run(N)
+        mc = MarkovChain(picklable_log_target, prop, start, indicator, rng=np.random.RandomState(rng_seed))
+        with ProcessPoolExecutor(2) as executor:
+            self.assertEqual(mc.run(N, prefetch_depth=2, executor=executor), accept_serial)
+        np.testing.assert_equal(mc.samples[:], mc_serial.samples[:])
+
+        # need batch proposals
+        mc = MarkovChain(log_target, LocalGaussNoBatch(offdiag_sigma), start)
+        self.assertRaisesRegex(ValueError, 'propose_batch', mc.run, N, prefetch_depth=2)
+
     @attr('slow')
     def test_sampling(self):
         delta_mean   = .002
@@ -146,6 +336,37 @@ class TestMarkovChain(unittest.TestCase):
 
         self.assertRaisesRegexp(ValueError, 'encountered NaN', mc.run)
 
+        # reject the NaN points if asked to
+        self.assertEqual(mc.run(10, continue_on_NaN=True), 0)
+        np.testing.assert_equal(mc.samples[-1], np.array(10 * [start]))
+
+    def test_run_stores_steps_before_NaN(self):
+        # the steps completed before an exception must be stored
+        log_target = lambda x: unnormalized_log_pdf_gauss(x, zero_mean, np.linalg.inv(offdiag_sigma))
+        start = np.array([.1, -.05])
+        N = 50
+        failing_step = 19
+
+        def nan_at_failing_step(x):
+            # the target is called once for ``start`` and once per step
+            calls.append(x)
+            return np.nan if len(calls) == failing_step + 2 else log_target(x)
+
+        for prop, prefetch_depth in ((density.gauss.LocalGauss(offdiag_sigma), 0),
+                                     (density.gauss.LocalGauss(offdiag_sigma), 1),
+                                     (LocalGaussNoBatch(offdiag_sigma)       , 0)):
+            mc_reference = MarkovChain(log_target, prop, start, rng=np.random.RandomState(rng_seed))
+            mc_reference.run(N)
+
+            calls = []
+            mc = MarkovChain(nan_at_failing_step, prop, start, rng=np.random.RandomState(rng_seed))
+            self.assertRaisesRegex(ValueError, 'encountered NaN', mc.run, N,
+                                   prefetch_depth=prefetch_depth, executor=SerialExecutor())
+
+            self.assertEqual(len(mc.samples[-1]), N)
+            np.testing.assert_equal(mc.samples[-1][:failing_step], mc_reference.samples[-1][:failing_step])
+            np.testing.assert_equal(mc.current_point, mc_reference.samples[-1][failing_step - 1])
+
     def test_history(self):
         # dummy; not a real proposal
         class ProposalPlusOne(density.base.ProbabilityDensity):
@@ -352,6 +573,10 @@ class TestAdaptiveMarkovChain(unittest.TestCase):
 
         mc.set_adapt_params(damping                = test_value)
 
+        mc.set_adapt_params(diminishing_after      = test_value)
+
+        mc.set_adapt_params(target_accept_rate     = test_value)
+
         self.assertEqual(mc.covar_scale_multiplier , test_value)
         self.assertEqual(mc.covar_scale_factor     , test_value)
         self.assertEqual(mc.covar_scale_factor_max , test_value)
@@ -359,8 +584,228 @@ class TestAdaptiveMarkovChain(unittest.TestCase):
         self.assertEqual(mc.force_acceptance_max   , test_value)
         self.assertEqual(mc.force_acceptance_min   , test_value)
         self.assertEqual(mc.damping                , test_value)
+        self.assertEqual(mc.diminishing_after      , test_value)
+        self.assertEqual(mc.target_accept_rate     , test_value)
 
         self.assertRaisesRegexp(TypeError, r'keyword args only; try set_adapt_parameters\(keyword = value\)',
                                 mc.set_adapt_params, test_value)
         self.assertRaisesRegexp(TypeError, r"unexpected keyword\(s\)\: ",
                                 mc.set_adapt_params, unknown_kw = test_value)
+
+    def test_target_accept_rate(self):
+        log_target = lambda x: unnormalized_log_pdf_gauss(x, zero_mean, np.linalg.inv(offdiag_sigma))
+        prop = density.gauss.LocalGauss(offdiag_sigma)
+        start = np.array([.1, -.05])
+
+        mc = AdaptiveMarkovChain(log_target, prop, start, target_accept_rate=.234,
+                                 covar_scale_factor=4.)
+
+        # too high acceptance --> scale up by exp(step * (0.8 - 0.234))
+        mc._update_scale_factor(.8)
+        self.assertAlmostEqual(mc.covar_scale_factor, 4. * np.exp(.8 - .234))
+
+        # step size shrinks with adapt_count
+        mc.adapt_count = 2**(1/.6)
+        mc.covar_scale_factor = 4.
+        mc._update_scale_factor(0.)
+        self.assertAlmostEqual(mc.covar_scale_factor, 4. * np.exp(-.234 / 2.))
+
+        # limits apply
+        mc.covar_scale_factor_max = 4.1
+        mc._update_scale_factor(1.)
+        self.assertEqual(mc.covar_scale_factor, 4.1)
+
+        # the acceptance rate approaches the target
+        mc = AdaptiveMarkovChain(log_target, prop, start, target_accept_rate=.5)
+        for i in range(30):
+            accept_count = mc.run(1000)
+            mc.adapt()
+        self.assertAlmostEqual(accept_count / 1000., .5, delta=.08)
+
+    def test_diminishing_adaptation(self):
+        log_target = lambda x: unnormalized_log_pdf_gauss(x, zero_mean, np.linalg.inv(offdiag_sigma))
+        prop = density.gauss.LocalGauss(np.eye(2))
+        start = np.array([.1, -.05])
+
+        mc = AdaptiveMarkovChain(log_target, prop, start, diminishing_after=2)
+
+        for i in range(2):
+            mc.run(500)
+            mc.adapt()
+        self.assertEqual(mc.adapt_count, 3)
+
+        # the proposal is frozen from now on
+        frozen_sigma = mc.proposal.sigma.copy()
+        frozen_scale_factor = mc.covar_scale_factor
+        for i in range(3):
+            mc.run(500)
+            mc.adapt()
+
+        self.assertEqual(mc.adapt_count, 3)
+        self.assertEqual(mc.covar_scale_factor, frozen_scale_factor)
+        np.testing.assert_equal(mc.proposal.sigma, frozen_sigma)
+
+        # resume adapting with the points of a run done while frozen
+        mc.run(500)
+        # third adaptation --> damping factor 1/3**damping
+        unscaled_sigma = np.cov(mc.samples[-1], rowvar=0) / 3. + (1 - 1/3.) * mc.unscaled_sigma
+        mc.set_adapt_params(diminishing_after=None, damping=1.)
+        mc.adapt()
+        self.assertEqual(mc.adapt_count, 4)
+        self.assertFalse((mc.proposal.sigma == frozen_sigma).all())
+        np.testing.assert_allclose(mc.unscaled_sigma, unscaled_sigma, rtol=1e-14)
+
+        mc.run(500)
+        mc.adapt()
+        self.assertEqual(mc.adapt_count, 5)
+
+class TestVectorizedMarkovChain(unittest.TestCase):
+    inv_sigma = np.linalg.inv(offdiag_sigma)
+
+    def setUp(self):
+        np.random.mtrand.seed(rng_seed)
+
+    def log_target(self, x):
+        return -.5 * np.einsum('ki,ij,kj->k', x, self.inv_sigma, x)
+
+    def test_invalid_start(self):
+        prop = density.gauss.LocalGauss(offdiag_sigma)
+        starts = np.zeros((3,2))
+
+        with self.assertRaises(ValueError):
+            VectorizedMarkovChain(lambda x: np.array([0., np.nan, 0.]), prop, starts)
+
+        with self.assertRaises(ValueError):
+            VectorizedMarkovChain(lambda x: np.array([0., 0., np.inf]), prop, starts)
+
+        with self.assertRaisesRegex(AssertionError, 'starts.*matrix'):
+            VectorizedMarkovChain(self.log_target, prop, np.zeros(2))
+
+        # an overridden ``propose`` cannot be vectorized
+        with self.assertRaisesRegex(ValueError, 'propose_batch'):
+            VectorizedMarkovChain(self.log_target, LocalGaussShifted(offdiag_sigma), starts)
+
+    def test_single_chain(self):
+        # one vectorized chain must reproduce the ordinary Markov chain
+        prop  = density.gauss.LocalGauss(offdiag_sigma)
+        start = np.array([.1, -.05])
+        N = 200
+
+        mc  = MarkovChain(lambda x: self.log_target(x[None,:])[0], prop, start, rng=np.random.RandomState(rng_seed))
+        vmc = VectorizedMarkovChain(self.log_target, prop, [start], rng=np.random.RandomState(rng_seed))
+
+        accept_count = mc.run(N)
+        np.testing.assert_equal(vmc.run(N), [accept_count])
+
+        self.assertEqual(len(vmc.samples), 1)
+        np.testing.assert_equal(vmc.samples[0][:], mc.samples[:])
+        np.testing.assert_equal(vmc.current_points[0], mc.current_point)
+
+    def test_sampling(self):
+        delta_mean = .005
+        delta_var0 = .001
+        delta_var1 = .0003
+        K = 20
+        N = 2000
+
+        prop = density.gauss.LocalGauss(offdiag_sigma)
+        starts = np.random.mtrand.normal(0., .01, (K, 2))
+
+        vmc = VectorizedMarkovChain(self.log_target, prop, starts, prealloc=N)
+        accept_counts = vmc.run(N)
+
+        self.assertEqual(accept_counts.shape, (K,))
+        self.assertTrue((accept_counts > 0).all())
+        self.assertTrue((accept_counts < N).all())
+
+        values = np.vstack([samples[:] for samples in vmc.samples])
+        self.assertEqual(values.shape, (K * N, 2))
+
+        np.testing.assert_allclose(values.mean(axis=0), zero_mean, atol=delta_mean)
+        self.assertAlmostEqual(values[:,0].var(), offdiag_sigma[0,0], delta=delta_var0)
+        self.assertAlmostEqual(values[:,1].var(), offdiag_sigma[1,1], delta=delta_var1)
+
+        vmc.clear()
+        for samples in vmc.samples:
+            self.assertEqual(len(samples), 0)
+
+    def test_hastings(self):
+        # the hastings factor of a gaussian is one --> must obtain the same chains
+        starts = np.array([[.1, -.05], [0., 0.], [-.1, .05]])
+        N = 100
+
+        vmc_symmetric  = VectorizedMarkovChain(self.log_target, density.gauss.LocalGauss(offdiag_sigma), starts,
+                                               rng=np.random.RandomState(rng_seed))
+        vmc_asymmetric = VectorizedMarkovChain(self.log_target, LocalGaussAsymmetric(offdiag_sigma), starts,
+                                               rng=np.random.RandomState(rng_seed))
+
+        np.testing.assert_equal(vmc_symmetric.run(N), vmc_asymmetric.run(N))
+        self.assertEqual(vmc_asymmetric.proposal.evaluate_count, 0)
+        self.assertEqual(vmc_asymmetric.proposal.multi_evaluate_count, 2)
+        for samples_symmetric, samples_asymmetric in zip(vmc_symmetric.samples, vmc_asymmetric.samples):
+            np.testing.assert_equal(samples_symmetric[:], samples_asymmetric[:])
+
+    def test_run_notices_NaN(self):
+        prop = density.gauss.LocalGauss(offdiag_sigma)
+        starts = np.zeros((2,2))
+        bad_target = lambda x: np.where((x == 0.).all(axis=1), 0., np.nan)
+
+        vmc = VectorizedMarkovChain(bad_target, prop, starts)
+        self.assertRaisesRegex(ValueError, 'encountered NaN', vmc.run)
+
+        # reject the NaN points if asked to
+        np.testing.assert_equal(vmc.run(10, continue_on_NaN=True), [0, 0])
+        np.testing.assert_equal(vmc.samples[1][-1], starts[:1].repeat(10, axis=0))
+
+    def test_run_stores_steps_before_exception(self):
+        # the steps completed before an exception must be stored
+        prop   = density.gauss.LocalGauss(offdiag_sigma)
+        starts = np.array([[.1, -.05], [0., 0.], [-.1, .05]])
+        N = 50
+        failing_step = 18
+
+        def fail_at_failing_step(x):
+            # the target is called once for ``starts`` and once per step
+            calls.append(x)
+            if len(calls) == failing_step + 2:
+                raise RuntimeError('target failed')
+            return self.log_target(x)
+
+        vmc_reference = VectorizedMarkovChain(self.log_target, prop, starts, rng=np.random.RandomState(rng_seed))
+        vmc_reference.run(N)
+
+        calls = []
+        vmc = VectorizedMarkovChain(fail_at_failing_step, prop, starts, rng=np.random.RandomState(rng_seed))
+        self.assertRaisesRegex(RuntimeError, 'target failed', vmc.run, N)
+
+        for k, (samples, samples_reference) in enumerate(zip(vmc.samples, vmc_reference.samples)):
+            self.assertEqual(len(samples), 1)
+            np.testing.assert_equal(samples[-1], samples_reference[-1][:failing_step])
+            np.testing.assert_equal(vmc.current_points[k], samples_reference[-1][failing_step - 1])
+
+    def test_indicator(self):
+        prop = density.gauss.LocalGauss(offdiag_sigma)
+        starts = np.zeros((3,2))
+        # support is the upper half plane
+        indicator = lambda x: x[1] >= 0.
+
+        called_with = []
+        def log_target(x):
+            called_with.append(x.copy())
+            return self.log_target(x)
+
+        with self.assertRaisesRegex(ValueError, 'indicator'):
+            VectorizedMarkovChain(log_target, prop, [[0., -1.]], indicator)
+
+        vmc = VectorizedMarkovChain(log_target, prop, starts, indicator)
+        del called_with[:]
+        vmc.run(100)
+
+        # at most one target call per step, and only inside the support;
+        # no call at all if every chain leaves the support
+        self.assertGreater(len(called_with), 0)
+        self.assertLessEqual(len(called_with), 100)
+        for points in called_with:
+            self.assertTrue((points[:,1] >= 0.).all())
+        for samples in vmc.samples:
+            self.assertTrue((samples[:][:,1] >= 0.).all())
@@ -15,7 +15,8 @@ class History(object):
     :param prealloc:
 
         Integer; indicates for how many points memory is allocated in advance.
-        When more memory is needed, it will be allocated on demand.
+        When more memory is needed, it will be allocated on demand; the
+        capacity is then at least doubled.
 
     Access:
 
@@ -100,9 +101,14 @@ class History(object):
         self._slice_for_run_nr.append( (new_points_start , new_points_stop) )
 
         if self.memleft < new_points_len: #need to allocate new memory
-            self.memleft = 0
-            #careful: do not use self._points because this may include unused memory
-            self._points  = _np.vstack(  (self[:],_np.empty((new_points_len, self.dim)))  )
+            # at least double the capacity such that many small runs
+            # cause only a logarithmic number of reallocations and copies
+            new_capacity = max(new_points_stop, 2 * len(self._points))
+            self.memleft = new_capacity - new_points_stop
+            new_memory = _np.empty((new_capacity, self.dim))
+            #careful: do not copy all of self._points because this may include unused memory
+            new_memory[:new_points_start] = self._points[:new_points_start]
+            self._points = new_memory
         else: #have enough memory
             self.memleft -= new_points_len
 
@@ -0,0 +1,46 @@
+"""Unit tests for the History.
+
+"""
+
+from ._history import *
+import numpy as np
+import unittest
+
+class TestHistory(unittest.TestCase):
+    def test_append(self):
+        h = History(2)
+        for i in range(3):
+            h.append(i+1)[:] = i+1
+
+        self.assertEqual(len(h), 3)
+        np.testing.assert_equal(h[0], [[1., 1.]])
+        np.testing.assert_equal(h[-1], [[3., 3.]] * 3)
+        np.testing.assert_equal(h[1:], [[2., 2.]] * 2 + [[3., 3.]] * 3)
+        np.testing.assert_equal(h[:], [[1., 1.]] + [[2., 2.]] * 2 + [[3., 3.]] * 3)
+
+    def test_growth(self):
+        h = History(3, prealloc=2)
+        target = np.arange(3 * 1000.).reshape(1000, 3)
+
+        capacities = set()
+        for i in range(1000):
+            h.append(1)[:] = target[i]
+            capacities.add(len(h._points))
+
+        np.testing.assert_equal(h[:], target)
+        self.assertEqual(len(h), 1000)
+        # capacity is doubled --> only few reallocations
+        self.assertEqual(sorted(capacities), [2 ** k for k in range(1, 11)])
+
+        # a run larger than the doubled capacity
+        h.append(5000)[:] = 1.
+        self.assertEqual(len(h[-1]), 5000)
+        np.testing.assert_equal(h[:1000], target)
+
+    def test_clear(self):
+        h = History(2, prealloc=4)
+        h.append(10)
+        h.clear()
+        self.assertEqual(len(h), 0)
+        self.assertEqual(h._points.shape, (4, 2))
+        self.assertEqual(h.memleft, 4)
@@ -24,20 +24,21 @@ def ball(center, radius=1., bdy=True):
     center = _np.array(center) # copy input parameter
     dim = len(center)
 
+    # compare squared distances to avoid the overhead of ``numpy.linalg.norm``
+    radius_sq = radius**2
+
     if bdy:
         def ball_indicator(x):
             if len(x) != dim:
                 raise ValueError('input has wrong dimension (%i instead of %i)' % (len(x), dim))
-            if _np.linalg.norm(x - center) <= radius:
-                return True
-            return False
+            diff = x - center
+            return bool(diff.dot(diff) <= radius_sq)
     else:
         def ball_indicator(x):
             if len(x) != dim:
                 raise ValueError('input has wrong dimension (%i instead of %i)' % (len(x), dim))
-            if _np.linalg.norm(x - center) < radius:
-                return True
-            return False
+            diff = x - center
+            return bool(diff.dot(diff) < radius_sq)
 
     # write docstring for ball_indicator
     ball_indicator.__doc__  = 'automatically generated ball indicator function:'
@@ -72,20 +73,17 @@ def hyperrectangle(lower, upper, bdy=True):
     if (upper <= lower).any():
         raise ValueError('invalid input; found upper <= lower')
 
+    # check both boundaries with a single reduction
     if bdy:
         def hr_indicator(x):
             if len(x) != dim:
                 raise ValueError('input has wrong dimension (%i instead of %i)' % (len(x), dim))
-            if (lower <= x).all() and (x <= upper).all():
-                return True
-            return False
+            return bool(((lower <= x) & (x <= upper)).all())
     else:
         def hr_indicator(x):
             if len(x) != dim:
                 raise ValueError('input has wrong dimension (%i instead of %i)' % (len(x), dim))
-            if (lower < x).all() and (x < upper).all():
-                return True
-            return False
+            return bool(((lower < x) & (x < upper)).all())
 
     # write docstring for ball_indicator
     hr_indicator.__doc__  = 'automatically generated hyperrectangle indicator function:'
@@ -1,3 +1,5 @@
+import numpy as _np
+
 def merge_function_with_indicator(function, indicator, alternative):
     '''Returns a function such that a call to it is equivalent to:
 
@@ -31,3 +33,42 @@ def merge_function_with_indicator(function, indicator, alternative):
             else:
                 return alternative
         return merged_function
+
+def merge_batch_function_with_indicator(function, indicator, alternative):
+    '''Returns a function acting on a matrix of points such that a call to
+    it is equivalent to:
+
+    [function(x) if indicator(x) else alternative for x in points]
+
+    but ``function`` is called only once, namely on all rows of ``points``
+    for which indicator evaluates to True.
+
+
+    :param function:
+
+        Function accepting a matrix-like numpy array with one point per
+        row and returning a 1d numpy array; called only on the rows inside
+        the support.
+
+    :param indicator:
+
+        Bool-returning function; the indicator. Receives a single point.
+
+    :param alternative:
+
+        The value to be returned for rows where indicator returns False
+
+    '''
+    if indicator is None:
+        return function
+    else:
+        def merged_function(points):
+            inside = _np.fromiter((indicator(x) for x in points), dtype=bool, count=len(points))
+            out = _np.empty(len(points))
+            out[~inside] = alternative
+            if inside.all():
+                out[:] = function(points)
+            elif inside.any():
+                out[inside] = function(points[inside])
+            return out
+        return merged_function
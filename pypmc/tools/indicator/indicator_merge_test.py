@@ -0,0 +1,47 @@
+"""Unit tests for merging functions with indicators.
+
+"""
+
+from . import *
+import numpy as np
+import unittest
+
+class TestMergeBatchFunctionWithIndicator(unittest.TestCase):
+    # upper half plane
+    indicator = staticmethod(lambda x: x[1] >= 0.)
+
+    def setUp(self):
+        self.called_with = []
+
+    def function(self, points):
+        self.called_with.append(points.copy())
+        return points.sum(axis=1)
+
+    def test_no_indicator(self):
+        function = lambda points: points.sum(axis=1)
+        self.assertIs(merge_batch_function_with_indicator(function, None, -np.inf), function)
+
+    def test_all_inside(self):
+        merged = merge_batch_function_with_indicator(self.function, self.indicator, -np.inf)
+        points = np.array([[1., 2.], [3., 0.], [-1., 5.]])
+
+        np.testing.assert_equal(merged(points), [3., 3., 4.])
+        self.assertEqual(len(self.called_with), 1)
+        np.testing.assert_equal(self.called_with[0], points)
+
+    def test_some_inside(self):
+        merged = merge_batch_function_with_indicator(self.function, self.indicator, -np.inf)
+        points = np.array([[1., 2.], [3., -1.], [-1., 5.], [0., -2.]])
+
+        np.testing.assert_equal(merged(points), [3., -np.inf, 4., -np.inf])
+
+        # only called on the points inside
+        self.assertEqual(len(self.called_with), 1)
+        np.testing.assert_equal(self.called_with[0], points[[0,2]])
+
+    def test_none_inside(self):
+        merged = merge_batch_function_with_indicator(self.function, self.indicator, 42.)
+        points = np.array([[1., -2.], [3., -1.]])
+
+        np.testing.assert_equal(merged(points), [42., 42.])
+        self.assertEqual(len(self.called_with), 0)